@@ -21,6 +21,7 @@ LANGUAGES = {
         "cpu": "CPU",
         "gpu": "GPU",
         "re_encode": "Re-encode to H.264 (better quality, smaller file)",
+        "fast_encode": "Fast encode (quicker, slightly lower quality)",
         "audio_pitch_shift": "Audio Pitch Shift",
         "pitch_semitones": "Pitch (semitones):",
         "preview_audio": "Preview Audio",
@@ -71,6 +72,7 @@ LANGUAGES = {
         "cpu": "پردازنده",
         "gpu": "کارت گرافیک",
         "re_encode": "Re-encode to H.264 ( کیفیت بالاتر ویدئو و اندازه کوچکترفایل خروجی)",
+        "fast_encode": "انکد سریع (سریع‌تر، کیفیت کمی پایین‌تر)",
         "audio_pitch_shift": "تغییر زیر و بم صدا",
         "pitch_semitones": "زیر و بم (نیم‌پرده):",
         "preview_audio": "پیش‌نمایش صدا",
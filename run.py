@@ -26,7 +26,7 @@ def find_venv_python():
     system = platform.system()
     
     if system == "Windows":
-        venv_python = app_dir / "venv" / "Script" / "python.exe"
+        venv_python = app_dir / "venv" / "Scripts" / "python.exe"
     else:
         venv_python = app_dir / "venv" / "bin" / "python3"
     
@@ -48,8 +48,6 @@ def run_app():
     else:
         print("Using system Python...")
         python_cmd = sys.executable
-    
-    system = platform.system()
 
     if not check_pyqt5():
         print("\nWARNING: PyQt5 not found!")
@@ -103,14 +101,15 @@ def run_app():
     
     try:
         if system == "Windows":
-            subprocess.run([python_cmd, str(gui_file)], check=True)
+            # Detach instead of subprocess.run(check=True): keeping the
+            # launcher resident for the GUI's whole lifetime just doubles
+            # the memory footprint.
+            subprocess.Popen([python_cmd, str(gui_file)])
+            sys.exit(0)
         else:
             os.execv(python_cmd, [python_cmd, str(gui_file)])
     except KeyboardInterrupt:
         print("\n\nApplication closed by user.")
-    except subprocess.CalledProcessError as e:
-        print(f"\nERROR: Failed to start application: {e}")
-        sys.exit(1)
     except Exception as e:
         print(f"\nERROR: {e}")
         sys.exit(1)